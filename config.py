@@ -5,6 +5,7 @@ class Config:
             "USER_AGENT": "Mozilla/5.0 (compatible; WebStrykerPython/1.0)",
             "MAX_RETRIES": 3,
             "TIMEOUT_SECONDS": 30,
+            "PHONE_REGION": "US",
         }
     
     def get(self, key: str, default=None):
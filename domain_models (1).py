@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class ProductEntity:
     """Product information"""
     product_name: str = ""
@@ -29,7 +29,7 @@ class ProductEntity:
             "url": self.url
         }
 
-@dataclass
+@dataclass(slots=True)
 class CompanyEntity:
     """Company information"""
     url: str = ""
@@ -56,26 +56,6 @@ class CompanyEntity:
             "products": [p.to_dict() for p in self.products]
         }
 
-    def to_sheet_row(self) -> List[str]:
-        """Convert to a row for Google Sheets"""
-        # Get the primary product if available
-        primary_product = self.products[0] if self.products else None
-        
-        return [
-            self.url,
-            self.company_name,
-            self.company_type,
-            self.company_description[:500] if self.company_description else "",
-            ", ".join(self.emails),
-            ", ".join(self.phones),
-            "; ".join(self.addresses),
-            primary_product.product_name if primary_product else "",
-            primary_product.main_category if primary_product else "",
-            str(primary_product.price) + " " + primary_product.currency if primary_product and primary_product.price > 0 else "",
-            primary_product.product_description[:500] if primary_product and primary_product.product_description else "",
-            ", ".join(p.product_name for p in self.products[1:])[:500] if len(self.products) > 1 else ""
-        ]
-
 class ExtractionState:
     """Tracks extraction progress"""
     def __init__(self, extraction_id: str, url: str):
@@ -1,31 +1,93 @@
+import asyncio
 import time
 import uuid
 import traceback
 import re
-import requests
-from typing import Dict, Any, Optional, List
-from urllib.parse import urlparse
+import aiohttp
+from bs4 import BeautifulSoup
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from datetime import datetime
 
 # Import domain models and extractors
 from domain_models import CompanyEntity, ProductEntity, ExtractionState, global_stats
 from config import config
-from logging_system import log_repository, log_execution_time
-from extractors_base import CompanyExtractor, ContactExtractor, ProductExtractor
-from google_sheets_integration import GoogleSheetsIntegration
+from logging_system import log_repository
+from extractors_base import CompanyExtractor, ContactExtractor, ProductExtractor, cached_urlparse
+from google_sheets_integration import get_sheets_integration
+
+# Characters urlparse strips or rejects in a URL; URLs containing them skip the fast path
+_URL_SPECIAL_CHARS_RE = re.compile(r'[\x00-\x20\x7f\[\]]')
 
 class ExtractionService:
     """Main service for extracting data"""
     
-    def __init__(self):
-        """Initialize extraction service"""
+    def __init__(self, write_to_sheets: bool = True):
+        """Initialize extraction service
+        
+        Callers that append rows to Sheets themselves pass write_to_sheets=False
+        and use the "sheet_row" records from stream_url instead.
+        """
         self.config_data = config
-        self.sheets_integration = GoogleSheetsIntegration('credentials.json', 'Web Stryker Pro+')
+        self.write_to_sheets = write_to_sheets
+        self._sheets_integration = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Event loop of the session built by get_session (None for caller-owned sessions)
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @property
+    def sheets_integration(self):
+        """Get the Sheets integration, connecting on first use"""
+        if self._sheets_integration is None:
+            self._sheets_integration = get_sheets_integration('credentials.json', 'Web Stryker Pro+')
+        return self._sheets_integration
+    
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared keep-alive HTTP session, creating it on first use inside each event loop"""
+        loop = asyncio.get_running_loop()
+        if self._session_loop is not None and self._session_loop is not loop:
+            # Built on an earlier loop (e.g. a previous asyncio.run) that can no
+            # longer run its cleanup, so drop it without closing and start over
+            if self.session is not None:
+                self.session.detach()
+            self.session = None
+            self._session_loop = None
+        
+        if self.session is None or self.session.closed:
+            timeout_seconds = self.config_data.get("TIMEOUT_SECONDS", 30)
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(total=timeout_seconds)
+            )
+            self._session_loop = loop
+        return self.session
+    
+    def set_session(self, session: aiohttp.ClientSession) -> None:
+        """Use a caller-owned HTTP session, so several extractions share one connection pool"""
+        self.session = session
+        self._session_loop = None
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._session_loop = None
     
     def validate_url(self, url: str) -> bool:
         """Validate URL format"""
+        if not isinstance(url, str):
+            return False
+        
+        # Fast path for plain http(s) URLs: valid when a host follows the scheme
+        if url.startswith(('http://', 'https://')):
+            rest = url[8:] if url[4] == 's' else url[7:]
+            if rest.isascii() and not _URL_SPECIAL_CHARS_RE.search(rest):
+                return bool(rest) and rest[0] not in '/?#'
+        
         try:
-            result = urlparse(url)
+            result = cached_urlparse(url)
             return all([result.scheme, result.netloc])
         except Exception:
             return False
@@ -39,20 +101,20 @@ class ExtractionService:
         }
         
         max_retries = self.config_data.get("MAX_RETRIES", 3)
-        timeout_seconds = self.config_data.get("TIMEOUT_SECONDS", 30)
+        session = self.get_session()
         
         for attempt in range(max_retries):
             try:
-                response = requests.get(url, headers=headers, timeout=timeout_seconds)
-                if response.status_code == 200:
-                    return response.text
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 200:
+                        return await response.text()
+                    
+                    log_repository.log_error(
+                        url, extraction_id, "FetchError", 
+                        f"Failed to fetch content: HTTP {response.status}"
+                    )
                 
-                log_repository.log_error(
-                    url, extraction_id, "FetchError", 
-                    f"Failed to fetch content: HTTP {response.status_code}"
-                )
-                
-            except requests.RequestException as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 log_repository.log_error(
                     url, extraction_id, "FetchError", 
                     f"Fetch attempt {attempt + 1} failed: {str(e)}"
@@ -61,86 +123,94 @@ class ExtractionService:
             # Add exponential backoff with jitter
             import random
             sleep_time = (2 ** attempt) + random.uniform(0, 1)
-            time.sleep(sleep_time)
+            await asyncio.sleep(sleep_time)
         
         return None
     
     def format_for_sheets(self, company: CompanyEntity) -> List[str]:
         """Format company data for Google Sheets."""
+        def format_price(product: ProductEntity) -> str:
+            return f"{product.price} {product.currency}" if product.price > 0 else "N/A"
+        
         # Get primary product
         primary_product = company.products[0] if company.products else None
         
-        # Format additional products
-        additional_products = []
-        if len(company.products) > 1:
-            for product in company.products[1:]:
-                product_info = {
-                    'name': product.product_name,
-                    'category': product.main_category,
-                    'price': f"{product.price} {product.currency}" if product.price > 0 else "N/A"
-                }
-                additional_products.append(str(product_info))
+        # Format additional products as "name | category | price"
+        additional_products = " || ".join(
+            f"{product.product_name} | {product.main_category} | {format_price(product)}"
+            for product in company.products[1:]
+        )
         
         # Prepare row data
+        if primary_product:
+            product_cells = [
+                primary_product.product_name,
+                primary_product.main_category,
+                format_price(primary_product),
+                (primary_product.product_description or "")[:500],
+                "; ".join(primary_product.features[:5]),
+                "; ".join(f"{k}: {v}" for k, v in list(primary_product.specifications.items())[:3]),
+            ]
+        else:
+            product_cells = ["", "", "N/A", "", "", ""]
+        
         row_data = [
             company.url,
             company.company_name,
             company.company_type,
-            company.company_description[:500] if company.company_description else "",
+            (company.company_description or "")[:500],
             "; ".join(company.emails),
             "; ".join(company.phones),
             "; ".join(company.addresses),
-            primary_product.product_name if primary_product else "",
-            primary_product.main_category if primary_product else "",
-            f"{primary_product.price} {primary_product.currency}" if primary_product and primary_product.price > 0 else "N/A",
-            primary_product.product_description[:500] if primary_product and primary_product.product_description else "",
-            "; ".join(primary_product.features[:5]) if primary_product and primary_product.features else "",
-            "; ".join(f"{k}: {v}" for k, v in list(primary_product.specifications.items())[:3]) if primary_product and primary_product.specifications else "",
-            " | ".join(additional_products),
+            *product_cells,
+            additional_products,
             datetime.now().isoformat()
         ]
         
         return row_data
     
-    @log_execution_time()
-    async def extract_data(self, url: str, extraction_id: str, extraction_state: ExtractionState) -> Optional[CompanyEntity]:
-        """Extract company and product data"""
+    # Extraction steps in order: (section, progress, status message, extractor class)
+    EXTRACTION_STEPS = (
+        ("company", 25, "Extracting company information", CompanyExtractor),
+        ("contacts", 40, "Extracting contact information", ContactExtractor),
+        ("products", 60, "Discovering product information", ProductExtractor),
+    )
+    
+    async def extract_sections(self, url: str, extraction_id: str, extraction_state: ExtractionState) -> AsyncIterator[Tuple[str, CompanyEntity]]:
+        """Fetch and parse a URL, yielding (section, company) as each extractor finishes.
+        
+        Yields nothing when the content cannot be fetched.
+        """
         # Fetch the URL content
         extraction_state.update_progress(15, "Fetching website content")
         content = await self.fetch_content(url, extraction_id)
         if not content:
-            return None
+            return
+        
+        # Parse once and share the tree between all extractors, keeping the
+        # CPU-bound work off the event loop so other fetches can proceed
+        loop = asyncio.get_running_loop()
+        soup = await loop.run_in_executor(None, BeautifulSoup, content, 'lxml')
         
-        # Create company entity
         company = CompanyEntity()
         company.url = url
-        
-        # Extract company information
-        extraction_state.update_progress(25, "Extracting company information")
-        company_extractor = CompanyExtractor(self.config_data)
-        company_extractor.extract(content, url, company)
-        
-        # Extract contact information
-        extraction_state.update_progress(40, "Extracting contact information")
-        contact_extractor = ContactExtractor(self.config_data)
-        contact_extractor.extract(content, url, company)
-        
-        # Extract product information
-        extraction_state.update_progress(60, "Discovering product information")
-        product_extractor = ProductExtractor(self.config_data)
-        product_extractor.extract(content, url, company, extraction_id)
-        
-        # Format and send data to Google Sheets
-        row_data = self.format_for_sheets(company)
-        self.sheets_integration.add_row(row_data)
-        
-        return company
+        for section, progress, message, extractor_class in self.EXTRACTION_STEPS:
+            extraction_state.update_progress(progress, message)
+            extractor = extractor_class(self.config_data)
+            if section == "products":
+                await loop.run_in_executor(None, extractor.extract, soup, url, company, extraction_id)
+            else:
+                await loop.run_in_executor(None, extractor.extract, soup, url, company)
+            yield section, company
     
-    async def process_url(self, url: str, extraction_id: str) -> Dict[str, Any]:
-        """Process a URL for extraction"""
+    async def run_sections(self, url: str, extraction_id: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Run the full extraction for a URL as it progresses.
+        
+        Yields (section, company) after each extractor, then ("status", result).
+        """
         try:
             # Start timing the overall extraction
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             
             # Create extraction state
             extraction_state = ExtractionState(extraction_id, url)
@@ -149,25 +219,34 @@ class ExtractionService:
             extraction_state.update_progress(5, "Validating URL")
             if not self.validate_url(url):
                 log_repository.log_error(url, extraction_id, "ValidationError", "Invalid URL format")
-                return {"success": False, "error": "Invalid URL format"}
+                yield "status", {"success": False, "error": "Invalid URL format"}
+                return
             
             # Extract data
             extraction_state.update_progress(10, "Starting extraction")
-            extracted_company = await self.extract_data(url, extraction_id, extraction_state)
+            extracted_company = None
+            async for section, extracted_company in self.extract_sections(url, extraction_id, extraction_state):
+                yield section, extracted_company
             
             if not extracted_company:
                 log_repository.log_operation(
                     url, extraction_id, "Extraction", "Failed", 
                     "Failed to extract data from URL"
                 )
-                return {"success": False, "error": "Failed to extract data from URL"}
+                yield "status", {"success": False, "error": "Failed to extract data from URL"}
+                return
+            
+            # Format and send data to Google Sheets
+            if self.write_to_sheets:
+                row_data = self.format_for_sheets(extracted_company)
+                self.sheets_integration.add_row(row_data)
             
             # Finalize
             extraction_state.update_progress(100, "Completed")
             
             # Calculate total duration
-            end_time = time.time()
-            total_duration = int((end_time - start_time) * 1000)  # in milliseconds
+            end_ns = time.perf_counter_ns()
+            total_duration = (end_ns - start_ns) // 1_000_000  # in milliseconds
             
             # Log completion
             log_repository.log_operation(
@@ -180,9 +259,8 @@ class ExtractionService:
             global_stats.success += 1
             
             # Return results
-            return {
+            yield "status", {
                 "success": True,
-                "data": extracted_company.to_dict(),
                 "duration_ms": total_duration
             }
             
@@ -197,10 +275,72 @@ class ExtractionService:
             
             global_stats.fail += 1
             
-            return {
+            yield "status", {
                 "success": False,
                 "error": error_message
             }
+    
+    async def run_extraction(self, url: str, extraction_id: str) -> Tuple[Optional[CompanyEntity], Dict[str, Any]]:
+        """Run the full extraction for a URL, returning the company and a status result"""
+        company = None
+        async for section, payload in self.run_sections(url, extraction_id):
+            if section == "status":
+                result = payload
+            else:
+                company = payload
+        return (company if result["success"] else None), result
+    
+    async def process_url(self, url: str, extraction_id: str) -> Dict[str, Any]:
+        """Process a URL for extraction"""
+        company, result = await self.run_extraction(url, extraction_id)
+        if company:
+            result["data"] = company.to_dict()
+        return result
+    
+    async def stream_url(self, url: str, extraction_id: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Process a URL, yielding (section, payload) records as each extractor finishes"""
+        async for section, payload in self.run_sections(url, extraction_id):
+            if section == "company":
+                yield "company", {
+                    "url": payload.url,
+                    "company_name": payload.company_name,
+                    "company_type": payload.company_type,
+                    "company_description": payload.company_description,
+                    "extraction_date": payload.extraction_date
+                }
+            elif section == "contacts":
+                yield "contacts", {
+                    "emails": payload.emails,
+                    "phones": payload.phones,
+                    "addresses": payload.addresses
+                }
+            elif section == "products":
+                for product in payload.products:
+                    # Drop repeated features before they are serialized or sent to Sheets
+                    product.features = list(dict.fromkeys(product.features))
+                    yield "product", product.to_dict()
+                yield "sheet_row", self.format_for_sheets(payload)
+            else:
+                yield section, payload
+    
+    async def process_urls(self, urls: List[str], concurrency: int = 32) -> List[Dict[str, Any]]:
+        """Process multiple URLs concurrently, returning results in input order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def process_url_with_limit(url: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_url(url, uuid.uuid4().hex)
+        
+        results = await asyncio.gather(
+            *(process_url_with_limit(url) for url in urls), return_exceptions=True
+        )
+        
+        # Keep one failed URL from discarding the results of the others
+        return [
+            {"success": False, "error": f"Error processing URL: {str(result)}"}
+            if isinstance(result, BaseException) else result
+            for result in results
+        ]
 
 # Create singleton instance
 extraction_service = ExtractionService()
@@ -1,17 +1,72 @@
 from typing import Dict, Any, List
-from bs4 import BeautifulSoup, NavigableString
+from bs4 import BeautifulSoup, Comment, NavigableString
 import re
-from urllib.parse import urljoin
+import phonenumbers
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse
 from domain_models import CompanyEntity, ProductEntity
 
+# URLs are parsed repeatedly during one extraction, so memoise the parse
+cached_urlparse = lru_cache(maxsize=4096)(urlparse)
+
+# Patterns compiled once at import
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_CLEAN_RE = re.compile(r'[^\w\s\-.,;:\'\"$£€()+]')
+_TITLE_SUFFIX_RE = re.compile(r'\s*[-–—]\s*.*$')
+_CONTACT_HREF_RE = re.compile(r'^(?:mailto|tel):', re.I)
+_NAV_RE = re.compile(r'\b(?:menu|search|close|open|next|previous|submit)\b', re.I)
+
+# Class-name patterns matched by BeautifulSoup against each class value
+_ABOUT_CLASS_RE = re.compile(r'description|overview|about', re.I)
+_ADDRESS_CLASS_RE = re.compile(r'address|location', re.I)
+_HEADLINE_CLASS_RE = re.compile(r'headline', re.I)
+_DESCRIPTION_CLASS_RE = re.compile(r'description', re.I)
+_OVERVIEW_CLASS_RE = re.compile(r'description|overview', re.I)
+_HIGHLIGHT_CLASS_RE = re.compile(r'feature|highlight', re.I)
+_BENEFIT_CLASS_RE = re.compile(r'feature|benefit', re.I)
+_SPEC_CLASS_RE = re.compile(r'feature|spec', re.I)
+_PRODUCT_CLASS_RE = re.compile(r'product|item|model', re.I)
+
+# Placeholder addresses that are never real contacts
+_EMAIL_SKIP_WORDS = ('example', 'test', 'user', 'email')
+
+# Tags whose text is never rendered on the page
+_HIDDEN_TAGS = frozenset({'script', 'style', 'noscript', 'template'})
+
+def lookup_host(host: str, table: Dict[str, Any]) -> Any:
+    """Find the table entry for a hostname or its closest parent domain"""
+    parts = host.split('.')
+    for i in range(len(parts) - 1):
+        value = table.get('.'.join(parts[i:]))
+        if value is not None:
+            return value
+    return None
+
 def clean_text(text: str) -> str:
     """Clean up extracted text"""
     # Remove extra whitespace
     text = ' '.join(text.split())
     # Remove common noise
-    text = re.sub(r'[^\w\s\-.,;:\'\"$£€()+]', '', text)
+    text = _CLEAN_RE.sub('', text)
     return text.strip()
 
+def contact_text(soup: BeautifulSoup) -> str:
+    """Get the text worth scanning for contact details.
+    
+    Joins the visible page text with mailto:/tel: link targets, skipping
+    scripts, styles and comments so that scans do not walk the whole markup.
+    """
+    parts = [
+        text for text in soup.find_all(string=True)
+        if text.parent.name not in _HIDDEN_TAGS and not isinstance(text, Comment)
+    ]
+    parts.extend(link['href'].split(':', 1)[1] for link in soup.find_all('a', href=_CONTACT_HREF_RE))
+    return ' '.join(parts)
+
+def element_text(element) -> str:
+    """Get the cleaned text of an element"""
+    return clean_text(element.get_text(strip=True))
+
 def is_valid_text(text: str) -> bool:
     """Check if text is valid for extraction"""
     # Must be at least 10 characters
@@ -21,32 +76,34 @@ def is_valid_text(text: str) -> bool:
     if len(text.split()) < 2:
         return False
     # Must not be just navigation text
-    nav_words = ['menu', 'search', 'close', 'open', 'next', 'previous', 'submit']
-    if any(word in text.lower() for word in nav_words):
+    if _NAV_RE.search(text):
         return False
     return True
 
 class CompanyExtractor:
     """Extracts company information from webpage"""
+    # Known company names by domain
+    _COMPANY_NAMES = {
+        'apple.com': "Apple",
+        'microsoft.com': "Microsoft",
+        'samsung.com': "Samsung",
+    }
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
     
-    def extract(self, content: str, url: str, company: CompanyEntity) -> None:
-        """Extract company information from HTML content"""
-        soup = BeautifulSoup(content, 'html.parser')
+    def extract(self, soup: BeautifulSoup, url: str, company: CompanyEntity) -> None:
+        """Extract company information from parsed HTML"""
+        host = cached_urlparse(url).hostname or ''
         
         # Get company name based on domain
-        if 'apple.com' in url:
-            company.company_name = "Apple"
-        elif 'microsoft.com' in url:
-            company.company_name = "Microsoft"
-        elif 'samsung.com' in url:
-            company.company_name = "Samsung"
+        if company_name := lookup_host(host, self._COMPANY_NAMES):
+            company.company_name = company_name
         else:
             if title := soup.find('title'):
                 # Clean up title
                 company_name = title.text.split('|')[0].strip()
-                company_name = re.sub(r'\s*[-–—]\s*.*$', '', company_name)
+                company_name = _TITLE_SUFFIX_RE.sub('', company_name)
                 company.company_name = clean_text(company_name)
         
         # Get company description
@@ -55,7 +112,7 @@ class CompanyExtractor:
         if meta_desc:
             description = meta_desc.get('content', '')
         else:
-            main_desc = soup.find(['div', 'section'], class_=lambda x: x and any(word in str(x) for word in ['description', 'overview', 'about']))
+            main_desc = soup.find(['div', 'section'], class_=_ABOUT_CLASS_RE)
             if main_desc:
                 description = main_desc.get_text(strip=True)
         
@@ -70,57 +127,48 @@ class ContactExtractor:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
     
-    def extract(self, content: str, url: str, company: CompanyEntity) -> None:
+    def extract(self, soup: BeautifulSoup, url: str, company: CompanyEntity) -> None:
         """Extract contact information"""
-        soup = BeautifulSoup(content, 'html.parser')
+        content = contact_text(soup)
         
         # Extract email addresses
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, content)
-        valid_emails = set()
-        for email in emails:
-            if '@' in email and '.' in email:
-                if not any(skip in email.lower() for skip in ['example', 'test', 'user', 'email']):
-                    valid_emails.add(email.lower())
-        company.emails = list(valid_emails)
+        # (dict.fromkeys drops duplicates while keeping page order)
+        emails = (email.lower() for email in _EMAIL_RE.findall(content))
+        company.emails = list(dict.fromkeys(
+            email for email in emails
+            if not any(skip in email for skip in _EMAIL_SKIP_WORDS)
+        ))
         
         # Extract phone numbers
-        phone_pattern = r'(?:\+1[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phones = re.findall(phone_pattern, content)
-        valid_phones = set()
-        for phone in phones:
-            cleaned = re.sub(r'[-.\s()]', '', phone)
-            if len(cleaned) >= 10:
-                if cleaned.startswith('1'):
-                    cleaned = '+' + cleaned
-                elif not cleaned.startswith('+'):
-                    cleaned = '+1' + cleaned
-                valid_phones.add(cleaned)
-        company.phones = list(valid_phones)[:5]  # Limit to 5 most relevant numbers
+        region = self.config.get("PHONE_REGION", "US")
+        phones = dict.fromkeys(
+            phonenumbers.format_number(match.number, phonenumbers.PhoneNumberFormat.E164)
+            for match in phonenumbers.PhoneNumberMatcher(content, region)
+        )
+        company.phones = list(phones)[:5]  # Limit to the first 5 numbers on the page
         
         # Extract addresses
-        address_elements = soup.find_all(['div', 'p'], class_=lambda x: x and any(word in str(x).lower() for word in ['address', 'location']))
-        for element in address_elements:
-            address = clean_text(element.get_text(strip=True))
-            if len(address) > 10 and not any(addr in address for addr in company.addresses):
-                company.addresses.append(address)
+        seen_addresses = {addr.lower() for addr in company.addresses}
+        add_seen = seen_addresses.add
+        add_address = company.addresses.append
+        for address in map(element_text, soup.find_all(['div', 'p'], class_=_ADDRESS_CLASS_RE)):
+            key = address.lower()
+            if len(address) > 10 and key not in seen_addresses:
+                add_seen(key)
+                add_address(address)
 
 class ProductExtractor:
     """Extracts product information"""
     def __init__(self, config: Dict[str, Any]):
         self.config = config
     
-    def extract(self, content: str, url: str, company: CompanyEntity, extraction_id: str) -> None:
+    def extract(self, soup: BeautifulSoup, url: str, company: CompanyEntity, extraction_id: str) -> None:
         """Extract product information"""
-        soup = BeautifulSoup(content, 'html.parser')
+        host = cached_urlparse(url).hostname or ''
         
         # Handle specific websites
-        if 'apple.com' in url:
-            self._extract_apple_product(soup, url, company)
-        elif 'microsoft.com' in url:
-            self._extract_microsoft_product(soup, url, company)
-        elif 'samsung.com' in url:
-            self._extract_samsung_product(soup, url, company)
+        if handler := lookup_host(host, self._PRODUCT_HANDLERS):
+            handler(self, soup, url, company)
         else:
             self._extract_generic_product(soup, url, company)
     
@@ -143,17 +191,14 @@ class ProductExtractor:
             product.main_category = "Tablets"
         
         # Get product description
-        if desc_elem := soup.find(['h1', 'h2'], class_=lambda x: x and 'headline' in str(x).lower()):
+        if desc_elem := soup.find(['h1', 'h2'], class_=_HEADLINE_CLASS_RE):
             desc = clean_text(desc_elem.get_text(strip=True))
             if is_valid_text(desc):
                 product.product_description = desc
         
         # Get features
-        feature_elements = soup.find_all(['div', 'p'], class_=lambda x: x and any(word in str(x).lower() for word in ['feature', 'highlight']))
-        for elem in feature_elements[:5]:  # Limit to 5 main features
-            feature = clean_text(elem.get_text(strip=True))
-            if is_valid_text(feature):
-                product.features.append(feature)
+        feature_elements = soup.find_all(['div', 'p'], class_=_HIGHLIGHT_CLASS_RE, limit=5)  # Limit to 5 main features
+        product.features = [feature for feature in map(element_text, feature_elements) if is_valid_text(feature)]
         
         if product.product_name:
             product.url = url
@@ -177,17 +222,14 @@ class ProductExtractor:
             product.sub_category = "Operating System"
         
         # Get product description
-        if desc_elem := soup.find(['p', 'div'], class_=lambda x: x and 'description' in str(x).lower()):
+        if desc_elem := soup.find(['p', 'div'], class_=_DESCRIPTION_CLASS_RE):
             desc = clean_text(desc_elem.get_text(strip=True))
             if is_valid_text(desc):
                 product.product_description = desc
         
         # Get features
-        feature_elements = soup.find_all(['li', 'div'], class_=lambda x: x and any(word in str(x).lower() for word in ['feature', 'benefit']))
-        for elem in feature_elements[:5]:  # Limit to 5 main features
-            feature = clean_text(elem.get_text(strip=True))
-            if is_valid_text(feature):
-                product.features.append(feature)
+        feature_elements = soup.find_all(['li', 'div'], class_=_BENEFIT_CLASS_RE, limit=5)  # Limit to 5 main features
+        product.features = [feature for feature in map(element_text, feature_elements) if is_valid_text(feature)]
         
         if product.product_name:
             product.url = url
@@ -204,17 +246,14 @@ class ProductExtractor:
             product.sub_category = "Android Phones"
         
         # Get product description
-        if desc_elem := soup.find(['h1', 'h2', 'div'], class_=lambda x: x and any(word in str(x).lower() for word in ['description', 'overview'])):
+        if desc_elem := soup.find(['h1', 'h2', 'div'], class_=_OVERVIEW_CLASS_RE):
             desc = clean_text(desc_elem.get_text(strip=True))
             if is_valid_text(desc):
                 product.product_description = desc
         
         # Get features
-        feature_elements = soup.find_all(['div', 'li'], class_=lambda x: x and any(word in str(x).lower() for word in ['feature', 'highlight']))
-        for elem in feature_elements[:5]:  # Limit to 5 main features
-            feature = clean_text(elem.get_text(strip=True))
-            if is_valid_text(feature):
-                product.features.append(feature)
+        feature_elements = soup.find_all(['div', 'li'], class_=_HIGHLIGHT_CLASS_RE, limit=5)  # Limit to 5 main features
+        product.features = [feature for feature in map(element_text, feature_elements) if is_valid_text(feature)]
         
         if product.product_name:
             product.url = url
@@ -222,8 +261,7 @@ class ProductExtractor:
     
     def _extract_generic_product(self, soup: BeautifulSoup, url: str, company: CompanyEntity) -> None:
         """Extract product information from generic websites"""
-        product_sections = soup.find_all(['section', 'div', 'article'], 
-            class_=lambda x: x and any(word in str(x).lower() for word in ['product', 'item', 'model']))
+        product_sections = soup.find_all(['section', 'div', 'article'], class_=_PRODUCT_CLASS_RE)
         
         for section in product_sections[:2]:  # Limit to 2 main products
             product = ProductEntity()
@@ -238,17 +276,21 @@ class ProductExtractor:
                 continue
             
             # Get product description
-            if desc_elem := section.find(['p', 'div'], class_=lambda x: x and 'description' in str(x).lower()):
+            if desc_elem := section.find(['p', 'div'], class_=_DESCRIPTION_CLASS_RE):
                 desc = clean_text(desc_elem.get_text(strip=True))
                 if is_valid_text(desc):
                     product.product_description = desc
             
             # Get features
-            feature_elements = section.find_all(['li', 'div'], class_=lambda x: x and any(word in str(x).lower() for word in ['feature', 'spec']))
-            for elem in feature_elements[:5]:  # Limit to 5 main features
-                feature = clean_text(elem.get_text(strip=True))
-                if is_valid_text(feature):
-                    product.features.append(feature)
+            feature_elements = section.find_all(['li', 'div'], class_=_SPEC_CLASS_RE, limit=5)  # Limit to 5 main features
+            product.features = [feature for feature in map(element_text, feature_elements) if is_valid_text(feature)]
             
             product.url = url
             company.products.append(product)
+    
+    # Site-specific handlers by domain, anything else uses the generic handler
+    _PRODUCT_HANDLERS = {
+        'apple.com': _extract_apple_product,
+        'microsoft.com': _extract_microsoft_product,
+        'samsung.com': _extract_samsung_product,
+    }
@@ -1,32 +1,213 @@
+import atexit
+import os
+import queue
+import random
+import ssl
+import threading
+import time
+from functools import lru_cache
 import gspread
+import httpx
+import requests
+from google.auth.transport.requests import AuthorizedSession
+from gspread.utils import a1_range_to_grid_range, convert_credentials
 from oauth2client.service_account import ServiceAccountCredentials
-from typing import List
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, get_encoding_from_headers, select_proxy
+from typing import Any, Dict, List, Optional, Tuple
+
+SCOPE = [
+    'https://spreadsheets.google.com/feeds',
+    'https://www.googleapis.com/auth/drive'
+]
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` calls per `period` seconds."""
+    def __init__(self, rate: int, period: float):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+# Sheets allows 60 write requests per minute per user, so stay just below it
+write_limiter = TokenBucket(55, 60)
+
+# Connection-specific headers are not allowed over HTTP/2
+HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'}
+
+class HTTP2Adapter(BaseAdapter):
+    """requests transport adapter that sends requests through an HTTP/2 httpx client.
+    
+    Mounted on the authorized session, so gspread and google-auth keep using
+    the requests API while calls share one multiplexed connection per host.
+    Redirects are left to requests, and response bodies are always read in
+    full before returning (Sheets replies are small JSON documents).
+    """
+    def __init__(self, max_connections: int = 10):
+        super().__init__()
+        self.max_connections = max_connections
+        self._clients: Dict[Tuple[Any, Any, Optional[str]], httpx.Client] = {}
+        self._lock = threading.Lock()
+
+    def get_client(self, verify, cert, proxy: Optional[str]) -> httpx.Client:
+        """Get the httpx client for a TLS and proxy configuration, creating it on first use."""
+        key = (verify, cert, proxy)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = httpx.Client(
+                    http2=True,
+                    verify=self.ssl_context(verify, cert),
+                    proxy=proxy,
+                    follow_redirects=False,
+                    limits=httpx.Limits(max_keepalive_connections=self.max_connections)
+                )
+            return client
+
+    @staticmethod
+    def ssl_context(verify, cert):
+        """Build an SSL context from requests-style verify and cert arguments."""
+        if verify is False:
+            return False
+        ca_bundle = verify if isinstance(verify, str) else DEFAULT_CA_BUNDLE_PATH
+        if os.path.isdir(ca_bundle):
+            context = ssl.create_default_context(capath=ca_bundle)
+        else:
+            context = ssl.create_default_context(cafile=ca_bundle)
+        if cert:
+            certfile, keyfile = cert if isinstance(cert, tuple) else (cert, None)
+            context.load_cert_chain(certfile, keyfile)
+        return context
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """Send a prepared request and return a requests Response."""
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        client = self.get_client(verify, cert, select_proxy(request.url, proxies))
+        headers = {
+            name: value for name, value in request.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+        try:
+            reply = client.request(
+                request.method, request.url, headers=headers, content=request.body, timeout=timeout
+            )
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        
+        response = requests.Response()
+        response.status_code = reply.status_code
+        response.headers = CaseInsensitiveDict(reply.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = reply.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        # The body is already read, so requests must not look for a raw stream
+        response._content = reply.content
+        response._content_consumed = True
+        return response
+
+    def close(self):
+        """Close the underlying httpx clients."""
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+def build_client(creds: ServiceAccountCredentials) -> gspread.Client:
+    """Build a gspread client for service account credentials.
+    
+    The client runs over HTTP/2, so repeated and concurrent API calls share
+    one multiplexed TLS connection instead of reconnecting.
+    """
+    session = AuthorizedSession(convert_credentials(creds))
+    session.mount('https://', HTTP2Adapter())
+    return gspread.Client(auth=creds, session=session)
+
+@lru_cache(maxsize=None)
+def get_client(creds_file: str) -> gspread.Client:
+    """Get an authorized gspread client, shared per credentials file."""
+    return build_client(ServiceAccountCredentials.from_json_keyfile_name(creds_file, SCOPE))
+
+@lru_cache(maxsize=None)
+def get_worksheet(creds_file: str, sheet_name: str) -> gspread.Worksheet:
+    """Get the first worksheet of a spreadsheet, opened once per process."""
+    return get_client(creds_file).open(sheet_name).sheet1
+
+@lru_cache(maxsize=None)
+def get_sheets_integration(creds_file: str, sheet_name: str) -> 'GoogleSheetsIntegration':
+    """Get the shared integration (and its writer thread) for a sheet."""
+    return GoogleSheetsIntegration(creds_file, sheet_name)
 
 class GoogleSheetsIntegration:
-    def __init__(self, creds_file: str, sheet_name: str):
+    def __init__(self, creds_file: Optional[str], sheet_name: str, batch_size: int = 50,
+                 flush_interval: float = 1.0, client: Optional[gspread.Client] = None):
         """Initialize Google Sheets integration.
         
         Args:
             creds_file (str): Path to the credentials JSON file
             sheet_name (str): Name of the Google Sheet to access
+            batch_size (int): Maximum number of rows written per request
+            flush_interval (float): Seconds to wait for more rows before writing a batch
+            client (gspread.Client): Authorized client to use instead of loading creds_file
         """
         self.creds_file = creds_file
         self.sheet_name = sheet_name
-        self.client = self.authenticate()
-        self.sheet = self.client.open(sheet_name).sheet1
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Optional[List[str]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        if client is None:
+            self.client = self.authenticate()
+            self.sheet = get_worksheet(creds_file, sheet_name)
+        else:
+            self.client = client
+            self.sheet = client.open(sheet_name).sheet1
         
-        # Set up headers if sheet is empty
-        if not self.sheet.get_all_values():
+        # Set up headers if sheet is empty (probe the first row only,
+        # fetching every value would download the whole sheet)
+        if not self.sheet.row_values(1):
             self.setup_headers()
+        
+        # Write rows from a background thread so callers never wait on the API
+        self._writer = threading.Thread(target=self._writer_loop, name="sheets-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_creds(cls, creds: Dict[str, Any], sheet_name: str, **kwargs) -> 'GoogleSheetsIntegration':
+        """Create an integration from already-parsed service account credentials."""
+        client = build_client(ServiceAccountCredentials.from_json_keyfile_dict(creds, SCOPE))
+        return cls(None, sheet_name, client=client, **kwargs)
 
     def authenticate(self):
-        """Authenticate with Google Sheets API."""
-        scope = [
-            'https://spreadsheets.google.com/feeds',
-            'https://www.googleapis.com/auth/drive'
-        ]
-        creds = ServiceAccountCredentials.from_json_keyfile_name(self.creds_file, scope)
-        return gspread.authorize(creds)
+        """Authenticate with Google Sheets API.
+        
+        The authorized client is cached, so credentials are only loaded
+        once per credentials file.
+        """
+        return get_client(self.creds_file)
 
     def setup_headers(self):
         """Set up the headers in the sheet."""
@@ -47,18 +228,106 @@ class GoogleSheetsIntegration:
             'Additional Products',
             'Extraction Date'
         ]
-        self.sheet.append_row(headers)
+        self._write(self.sheet.append_row, headers)
 
     def add_row(self, data: List[str]):
-        """Add a new row to the sheet.
+        """Queue a new row for the sheet without blocking.
+        
+        Rows are written by the background writer in batches of up to
+        `batch_size` rows.
         
         Args:
             data (List[str]): List of values to add as a new row
         """
-        try:
-            self.sheet.append_row(data)
-        except Exception as e:
-            print(f"Error writing to Google Sheet: {str(e)}")
+        self._queue.put(data)
+
+    def add_rows(self, rows: List[List[str]]):
+        """Append many rows to the sheet in a single request.
+        
+        Rows still queued by add_row are written first, so the sheet keeps
+        the order in which rows were added.
+        
+        Args:
+            rows (List[List[str]]): Rows to add, each a list of values
+        """
+        if not rows:
+            return
+        self.flush()
+        self._write(self.sheet.append_rows, rows, value_input_option='RAW')
+
+    def flush(self):
+        """Block until every queued row has been written."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Write any queued rows and stop the background writer."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _writer_loop(self):
+        """Collect queued rows into batches and append them to the sheet."""
+        stopping = False
+        while not stopping:
+            row = self._queue.get()
+            if row is None:
+                self._queue.task_done()
+                break
+            
+            rows = [row]
+            deadline = time.monotonic() + self.flush_interval
+            while len(rows) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                rows.append(row)
+            
+            try:
+                self._write(self.sheet.append_rows, rows, value_input_option='RAW')
+            except Exception as e:
+                print(f"Error writing to Google Sheet: {str(e)}")
+            finally:
+                for _ in range(len(rows) + stopping):
+                    self._queue.task_done()
+
+    def batch(self, operations: List[Tuple[str, Any]]):
+        """Apply several writes to the sheet in a single API request.
+        
+        Args:
+            operations (List[Tuple[str, Any]]): Operations applied in order, each
+                either ('append', rows) or ('clear', a1_range)
+        """
+        sheet_id = self.sheet.id
+        body_requests = []
+        for operation, argument in operations:
+            if operation == 'append':
+                body_requests.append({'appendCells': {
+                    'sheetId': sheet_id,
+                    'rows': [
+                        {'values': [{'userEnteredValue': {'stringValue': str(value)}} for value in row]}
+                        for row in argument
+                    ],
+                    'fields': 'userEnteredValue'
+                }})
+            elif operation == 'clear':
+                body_requests.append({'updateCells': {
+                    'range': a1_range_to_grid_range(argument, sheet_id),
+                    'fields': 'userEnteredValue'
+                }})
+            else:
+                raise ValueError(f"Unknown batch operation: {operation}")
+        
+        # Queued rows were added first, so write them before this batch
+        self.flush()
+        return self._write(self.sheet.spreadsheet.batch_update, {'requests': body_requests})
 
     def clear_sheet(self, keep_headers: bool = True):
         """Clear all data from the sheet.
@@ -66,9 +335,25 @@ class GoogleSheetsIntegration:
         Args:
             keep_headers (bool): Whether to keep the header row
         """
+        self.flush()
+        
         if keep_headers:
             headers = self.sheet.row_values(1)
-            self.sheet.clear()
-            self.sheet.append_row(headers)
+            self._write(self.sheet.clear)
+            self._write(self.sheet.append_row, headers)
         else:
-            self.sheet.clear()
\ No newline at end of file
+            self._write(self.sheet.clear)
+
+    def _write(self, func, *args, max_retries: int = 5, **kwargs):
+        """Call a Sheets write method under the shared rate limit.
+        
+        Requests rejected with HTTP 429 are retried with exponential backoff.
+        """
+        for attempt in range(max_retries):
+            write_limiter.acquire()
+            try:
+                return func(*args, **kwargs)
+            except gspread.exceptions.APIError as e:
+                if e.response.status_code != 429 or attempt == max_retries - 1:
+                    raise
+                time.sleep((2 ** attempt) + random.uniform(0, 1))
\ No newline at end of file
@@ -1,30 +1,51 @@
 """Logging system module"""
+import atexit
+import logging
+import queue
+import sys
 import time
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional, Callable, Any
 
+# Records are queued by callers and written to stdout by a listener thread,
+# so logging never blocks on console I/O
+logger = logging.getLogger("webstryker")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+_listener = QueueListener(_log_queue, _stream_handler)
+logger.addHandler(QueueHandler(_log_queue))
+_listener.start()
+atexit.register(_listener.stop)
+
 class LogRepository:
     def log_error(self, url: str, extraction_id: str, error_type: str, message: str, stack_trace: str = None):
         """Log an error"""
-        print(f"ERROR [{error_type}] {url} ({extraction_id}): {message}")
+        logger.error("ERROR [%s] %s (%s): %s", error_type, url, extraction_id, message)
         if stack_trace:
-            print(f"Stack trace: {stack_trace}")
+            logger.error("Stack trace: %s", stack_trace)
     
     def log_operation(self, url: str, extraction_id: str, operation: str, status: str, message: str, duration_ms: int = None):
         """Log an operation"""
-        duration_info = f" ({duration_ms}ms)" if duration_ms is not None else ""
-        print(f"{operation} {status}: {url} ({extraction_id}){duration_info} - {message}")
+        if duration_ms is not None:
+            logger.info("%s %s: %s (%s) (%sms) - %s", operation, status, url, extraction_id, duration_ms, message)
+        else:
+            logger.info("%s %s: %s (%s) - %s", operation, status, url, extraction_id, message)
 
 def log_execution_time() -> Callable:
     """Decorator to log execution time of functions"""
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
-            start_time = time.time()
+            start_ns = time.perf_counter_ns()
             result = await func(*args, **kwargs)
-            end_time = time.time()
-            duration_ms = int((end_time - start_time) * 1000)
-            print(f"{func.__name__} executed in {duration_ms}ms")
+            end_ns = time.perf_counter_ns()
+            duration_ms = (end_ns - start_ns) // 1_000_000
+            logger.info("%s executed in %dms", func.__name__, duration_ms)
             return result
         return wrapper
     return decorator
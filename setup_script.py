@@ -29,7 +29,7 @@ setup(
             "webstryker=webstryker.main:main_entry",
         ],
     },
-    python_requires=">=3.7",
+    python_requires=">=3.10",
     include_package_data=True,
     package_data={
         "webstryker": [
@@ -44,9 +44,7 @@ setup(
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.7",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
         "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
     ],
 )
@@ -1,7 +1,189 @@
 import asyncio
-import json
+import aiohttp
+import multiprocessing.util
+import orjson
+import os
+import re
+import sys
+import time
+from collections import defaultdict
 from datetime import datetime
-from extraction_service import extraction_service
+from aiomultiprocess import Pool
+
+# Slug rewrite tables, built once instead of per URL
+_SCHEME = re.compile(r'^https?://')
+_SLUG = str.maketrans({'/': '-'})
+
+# Per-URL time limit and circuit breaker: after this many consecutive
+# failures URLs are skipped until a probe after the cooldown succeeds
+URL_TIMEOUT_SECONDS = 30
+FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 30
+CHILD_CONCURRENCY = 4
+
+# Extraction service of the current pool worker, set up by init_worker
+_worker_service = None
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over consecutive URL failures.
+    
+    Used from the parent's event loop only, so it needs no locking.
+    """
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.state = "closed"
+        self.opened_at = 0.0
+
+    def allow(self):
+        """Return whether the next URL may run; once cooled down, lets one probe through."""
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = "half-open"
+            return True
+        return False
+
+    def record(self, success):
+        """Record a URL outcome, closing on success and opening on too many failures."""
+        if success:
+            self.failures = 0
+            self.state = "closed"
+            return
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+def init_worker():
+    """Give a pool worker its own extraction service and pooled HTTP session.
+    
+    aiohttp sessions cannot cross process boundaries, so each worker opens
+    its own and every URL the worker handles reuses it. Rows are appended to
+    the sheet by the parent once all URLs finish, so workers never connect
+    to Sheets.
+    """
+    global _worker_service
+    from extraction_service import ExtractionService
+    
+    service = _worker_service = ExtractionService(write_to_sheets=False)
+    loop = asyncio.get_event_loop()
+    
+    async def open_session():
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, enable_cleanup_closed=True),
+            timeout=aiohttp.ClientTimeout(total=service.config_data.get("TIMEOUT_SECONDS", 30))
+        )
+    
+    service.set_session(loop.run_until_complete(open_session()))
+    # Workers skip atexit hooks but do run multiprocessing finalizers on exit
+    multiprocessing.util.Finalize(
+        None, lambda: loop.run_until_complete(service.close()), exitpriority=10
+    )
+
+def encode_record(section, payload):
+    """Serialize one result record as a JSON Lines entry."""
+    return orjson.dumps({"section": section, "data": payload}) + b"\n"
+
+async def process_one(url_index, url, timestamp):
+    """Extract a single URL inside a pool worker process.
+    
+    Each (section, payload) record is appended to a JSON Lines file as soon
+    as the service yields it, instead of dumping one document at the end.
+    """
+    slug = 'test-' + _SCHEME.sub('', url).translate(_SLUG)
+    filename = f'extraction_result_{url_index}_{timestamp}.jsonl'
+    product_count = 0
+    sheet_row = None
+    result = {"success": False, "error": "No result"}
+    
+    async def stream():
+        nonlocal result, product_count, sheet_row
+        with open(filename, 'wb') as f:
+            async for section, payload in _worker_service.stream_url(url, slug):
+                # The Sheets row is only handed back for the append, not saved
+                if section == "sheet_row":
+                    sheet_row = payload
+                    continue
+                # Serialize in a thread so the loop keeps serving other URLs, but
+                # write here: a timeout must never close the file under a writer
+                f.write(await asyncio.to_thread(encode_record, section, payload))
+                # Only the outcome is kept; the report reads the records back from the file
+                if section == "status":
+                    result = payload
+                elif section == "product":
+                    product_count += 1
+    
+    try:
+        await asyncio.wait_for(stream(), URL_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        result = {"success": False, "error": "timeout"}
+    
+    result["filename"] = filename
+    if result["success"]:
+        result["product_count"] = product_count
+        result["sheet_row"] = sheet_row
+    return result
+
+# Report layout: one template per section (descriptions are cut at 150
+# characters) and (label, key, limit) for contact lists
+COMPANY_TEMPLATE = (
+    "\n1. Company Information:\n"
+    "   Name: {company_name}\n"
+    "   Type: {company_type}\n"
+    "   Description: {company_description:.150}"
+)
+PRODUCT_TEMPLATE = (
+    "\n   Product {index}:\n"
+    "   - Name: {name}\n"
+    "   - Description: {description:.150}\n"
+    "   - Category: {category}\n"
+    "   - Price: {price}\n"
+    "   - Features: {features}\n"
+    "   - Specifications: {specifications}"
+)
+CONTACT_LISTS = (
+    ('Emails', 'emails', 5),
+    ('Phones', 'phones', 5),
+    ('Addresses', 'addresses', None),
+)
+
+def fill(template, record):
+    """Fill a report template, showing N/A for missing or empty values."""
+    return template.format_map(defaultdict(lambda: 'N/A', {key: value for key, value in record.items() if value}))
+
+def render_list(name, items, limit):
+    """Render a counted list, showing at most `limit` items (all if None)."""
+    if not items:
+        return []
+    shown = items[:limit]
+    lines = [f"   {name} ({len(items)}):"]
+    lines.extend(f"   - {item}" for item in shown)
+    if len(items) > len(shown):
+        lines.append(f"   ... and {len(items) - len(shown)} more")
+    return lines
+
+def render_results(filename, product_count):
+    """Render the report sections of a results file, one record at a time."""
+    lines = []
+    index = 0
+    with open(filename, 'rb') as f:
+        for line in f:
+            record = orjson.loads(line)
+            section, payload = record["section"], record["data"]
+            if section == "company":
+                lines.append(fill(COMPANY_TEMPLATE, payload))
+            elif section == "contacts":
+                lines.append("\n2. Contact Information:")
+                for name, key, limit in CONTACT_LISTS:
+                    lines.extend(render_list(name, payload.get(key), limit))
+            elif section == "product":
+                index += 1
+                if index == 1:
+                    lines.append(f"\n3. Products Found ({product_count}):")
+                lines.append(fill(PRODUCT_TEMPLATE, {**payload, "index": index}))
+    return lines
 
 async def test_extraction():
     # Test URLs - using different types of websites
@@ -13,83 +195,61 @@ async def test_extraction():
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    for url_index, url in enumerate(test_urls, 1):
-        print(f"\nTesting URL ({url_index}/{len(test_urls)}): {url}")
-        print("-" * 80)
+    # Spread URLs over worker processes, each running its own event loop, so
+    # HTML parsing scales across cores as well as network waits
+    processes = min(os.cpu_count() or 1, len(test_urls))
+    breaker = CircuitBreaker(FAILURE_THRESHOLD, BREAKER_COOLDOWN_SECONDS)
+    # Hand out no more URLs than the pool runs at once, so the breaker has
+    # seen earlier results by the time later URLs are dispatched
+    slots = asyncio.Semaphore(processes * CHILD_CONCURRENCY)
+    async with Pool(processes=processes, childconcurrency=CHILD_CONCURRENCY, initializer=init_worker) as pool:
+        async def dispatch(url_index, url):
+            async with slots:
+                if not breaker.allow():
+                    return {"success": False, "error": "circuit-open", "filename": None}
+                result = await pool.apply(process_one, (url_index, url, timestamp))
+                breaker.record(result["success"])
+                return result
         
-        result = await extraction_service.process_url(url, f"test-{url.replace('https://', '').replace('/', '-')}")
+        results = await asyncio.gather(
+            *(dispatch(url_index, url) for url_index, url in enumerate(test_urls, 1))
+        )
+        # Let workers exit on their own so their finalizers close the HTTP sessions
+        # (leaving the block alone would terminate them)
+        pool.close()
+        await pool.join()
+    
+    for url_index, (url, result) in enumerate(zip(test_urls, results), 1):
+        # Build each URL's report in memory and write it with a single call
+        lines = []
+        lines.append(f"\nTesting URL ({url_index}/{len(test_urls)}): {url}")
+        lines.append("-" * 80)
         
         if result["success"]:
-            print("✓ Extraction successful")
-            data = result["data"]
+            lines.append("✓ Extraction successful")
+            lines.extend(render_results(result['filename'], result['product_count']))
             
-            # Company Info
-            print("\n1. Company Information:")
-            print(f"   Name: {data.get('company_name', 'N/A')}")
-            print(f"   Type: {data.get('company_type', 'N/A')}")
-            if desc := data.get('company_description'):
-                print(f"   Description: {desc[:150]}...")
-            
-            # Contact Info
-            print("\n2. Contact Information:")
-            if emails := data.get('emails', []):
-                print(f"   Emails ({len(emails)}):")
-                for email in emails[:5]:
-                    print(f"   - {email}")
-                if len(emails) > 5:
-                    print(f"   ... and {len(emails) - 5} more")
-            
-            if phones := data.get('phones', []):
-                print(f"   Phones ({len(phones)}):")
-                for phone in phones[:5]:
-                    print(f"   - {phone}")
-                if len(phones) > 5:
-                    print(f"   ... and {len(phones) - 5} more")
-            
-            if addrs := data.get('addresses', []):
-                print(f"   Addresses ({len(addrs)}):")
-                for addr in addrs:
-                    print(f"   - {addr}")
-            
-            # Products Info
-            if products := data.get('products', []):
-                print(f"\n3. Products Found ({len(products)}):")
-                for i, product in enumerate(products, 1):
-                    print(f"\n   Product {i}:")
-                    print(f"   - Name: {product.get('name', 'N/A')}")
-                    if desc := product.get('description'):
-                        print(f"   - Description: {desc[:150]}...")
-                    if cat := product.get('category'):
-                        print(f"   - Category: {cat}")
-                    if price := product.get('price'):
-                        print(f"   - Price: {price}")
-                    if features := product.get('features'):
-                        print(f"   - Features ({len(features)}):")
-                        for feature in features[:3]:
-                            print(f"     * {feature}")
-                        if len(features) > 3:
-                            print(f"     ... and {len(features) - 3} more")
-                    if specs := product.get('specifications'):
-                        print(f"   - Specifications:")
-                        for key, value in list(specs.items())[:3]:
-                            print(f"     * {key}: {value}")
-                        if len(specs) > 3:
-                            print(f"     ... and {len(specs) - 3} more")
-                    if images := product.get('images', []):
-                        print(f"   - Images: {len(images)} found")
-            
-            print(f"\nExtraction Duration: {result['duration_ms']}ms")
-            
-            # Save detailed results to file
-            filename = f'extraction_result_{url_index}_{timestamp}.json'
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
-            print(f"Detailed results saved to: {filename}")
+            lines.append(f"\nExtraction Duration: {result['duration_ms']}ms")
+            lines.append(f"Detailed results saved to: {result['filename']}")
             
         else:
-            print(f"✗ Extraction failed: {result['error']}")
+            lines.append(f"✗ Extraction failed: {result['error']}")
+            if result['filename']:
+                lines.append(f"Details saved to: {result['filename']}")
         
-        print("\n" + "="*80)
+        lines.append("\n" + "="*80)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+    
+    # Append every extracted row to the sheet in a single request
+    rows = [result["sheet_row"] for result in results if result["success"]]
+    if rows:
+        try:
+            from google_sheets_integration import get_sheets_integration
+            sheets = get_sheets_integration('credentials.json', 'Web Stryker Pro+')
+            await asyncio.to_thread(sheets.add_rows, rows)
+        except Exception as e:
+            print(f"Error writing to Google Sheets: {str(e)}")
 
 if __name__ == "__main__":
     asyncio.run(test_extraction())
\ No newline at end of file
@@ -1,29 +1,30 @@
-import json
-import gspread
-from google_sheets_integration import GoogleSheetsIntegration
+import mmap
+import orjson
 
 def test_connection():
+    # Imported here so the Google client stack only loads when the test runs
+    import gspread
+    from google_sheets_integration import GoogleSheetsIntegration
+    
     try:
         # First, verify the credentials file can be read
         print("Testing credentials file...")
-        with open('credentials.json', 'r') as f:
-            creds = json.load(f)
+        # Parse straight from the mapped file, the parsed dict is reused below
+        with open('credentials.json', 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            creds = orjson.loads(view)
         print("Credentials file loaded successfully!")
         
         print("\nTesting Google Sheets connection...")
         # Initialize the Google Sheets integration
-        sheets = GoogleSheetsIntegration('credentials.json', 'Web Stryker Pro+')
+        sheets = GoogleSheetsIntegration.from_creds(creds, 'Web Stryker Pro+')
         
-        # Try to add a test row
+        # Add several test rows and clear the data rows again in one request
         test_data = ['Test', 'Connection', 'Successful']
-        sheets.add_row(test_data)
-        print("Successfully connected to Google Sheets and added test data!")
+        sheets.batch([('append', [test_data] * 5), ('clear', 'A2:Z')])
+        print("Successfully connected to Google Sheets, added and cleared test data!")
         
-        # Clear the test data
-        sheets.clear_sheet()
-        print("Successfully cleared test data!")
-        
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"Error reading credentials file: {str(e)}")
         print("Please check if the credentials.json file is properly formatted")
     except gspread.exceptions.APIError as e:
@@ -38,5 +39,57 @@ def test_connection():
         print(f"Error: {str(e)}")
         print(f"Error type: {type(e)}")
 
+def test_http2_adapter():
+    """Send requests through HTTP2Adapter against a local server."""
+    import json
+    import threading
+    import requests
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from google_sheets_integration import HTTP2Adapter
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/redirect':
+                self.send_response(302)
+                self.send_header('Location', '/echo')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            else:
+                self.reply(b'')
+        
+        def do_POST(self):
+            self.reply(self.rfile.read(int(self.headers['Content-Length'])))
+        
+        def reply(self, body):
+            payload = json.dumps({"path": self.path, "body": body.decode()}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    session = requests.Session()
+    session.mount('http://', HTTP2Adapter())
+    try:
+        print("\nTesting HTTP/2 adapter...")
+        response = session.post(f"{base}/echo", json={"rows": [1, 2]}, timeout=5)
+        assert response.json() == {"path": "/echo", "body": '{"rows": [1, 2]}'}
+        
+        response = session.get(f"{base}/redirect", timeout=5)
+        assert response.json()["path"] == "/echo"
+        assert [r.status_code for r in response.history] == [302]
+        assert b"".join(response.iter_content(8)) == response.content
+        print("Requests sent through the adapter, redirect followed!")
+    finally:
+        session.close()
+        server.shutdown()
+
 if __name__ == "__main__":
-    test_connection()
\ No newline at end of file
+    test_connection()
+    test_http2_adapter()
\ No newline at end of file